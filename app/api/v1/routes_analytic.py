@@ -1,37 +1,47 @@
 # app/api/v1/routes_analytic.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from app.models.ode_requests import AnalyticRequest
 from app.models.ode_responses import AnalyticResponse
+from app.models.examples import ODE_EXAMPLES, request_examples
+from app.core.executor import run_in_solver_pool
+from app.core.responses import orjson_response
+from app.core.grid import build_time_grid
 from app.core.parser import parse_rhs
-from app.services.analytic_solver import analytic_solver
+from app.services.analytic_solver import analytic_solution
 
 
 router = APIRouter()
 
 
+def _solve_analytic(request: AnalyticRequest) -> Response:
+    """
+    Lógica de /analytic (se ejecuta en el pool de cálculo).
+    """
+    try:
+        f_sym, _ = parse_rhs(request.f)
+        grid = build_time_grid(request.t0, request.T, request.h)
+        exact_values, meta = analytic_solution(f_sym, request.t0, request.T, request.h, request.y0)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno en analítico: {e}")
+
+    return orjson_response({"grid": grid, "exact": exact_values, "meta": meta})
+
+
 @router.post(
     "/analytic",
-    response_model=AnalyticResponse,
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_model=None,
+    responses={200: {"model": AnalyticResponse}},
     summary="Intentar resolver analíticamente la EDO",
     description=(
         "Intenta obtener la solución analítica de la EDO de primer orden y' = f(t, y) "
         "usando SymPy (dsolve). Devuelve la solución evaluada en el grid si es posible."
     ),
 )
-def solve_analytic(request: AnalyticRequest):
+async def solve_analytic(request: AnalyticRequest):
     """
     Intenta resolver analíticamente y' = f(t, y(t)) con y(t0)=y0.
     """
-    try:
-        f_sym, _ = parse_rhs(request.f)
-        grid, exact_values, meta = analytic_solver(f_sym, request.t0, request.y0, request.T, request.h)
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error interno en analítico: {e}")
-
-    return AnalyticResponse(
-        grid=grid,
-        exact=exact_values,
-        meta=meta
-    )
+    return await run_in_solver_pool(_solve_analytic, request)
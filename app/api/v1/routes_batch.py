@@ -0,0 +1,61 @@
+# app/api/v1/routes_batch.py
+import numpy as np
+from fastapi import APIRouter, HTTPException, Response
+from app.models.ode_requests import BatchRequest
+from app.models.ode_responses import BatchResponse
+from app.models.examples import BATCH_EXAMPLES, request_examples
+from app.core.executor import run_in_solver_pool
+from app.core.responses import orjson_response
+from app.core.grid import build_time_grid
+from app.core.parser import linear_coefficient, parse_rhs
+from app.services.batch_solver import euler_ensemble, rk4_ensemble
+
+
+router = APIRouter()
+
+
+def _solve_batch(request: BatchRequest) -> Response:
+    """
+    Lógica de /batch (se ejecuta en el pool de cálculo).
+    """
+    try:
+        f_sym, f_num = parse_rhs(request.f)
+        grid = build_time_grid(request.t0, request.T, request.h)
+        y0s = np.asarray(request.y0, dtype=np.float64)
+        lam = linear_coefficient(f_sym)
+        lam = None if lam is None else float(lam)
+        with np.errstate(all="ignore"):
+            y_euler = euler_ensemble(f_sym, f_num, grid, y0s, lam)
+            y_rk4 = rk4_ensemble(f_sym, f_num, grid, y0s, lam)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno en lote: {e}")
+
+    meta = {
+        "n_trajectories": len(request.y0),
+        "convergence_order_euler": 1,
+        "convergence_order_rk4": 4,
+    }
+
+    # Y tiene forma (B, n): una lista por trayectoria
+    return orjson_response({"grid": grid, "euler": y_euler, "rk4": y_rk4, "meta": meta})
+
+
+@router.post(
+    "/batch",
+    openapi_extra=request_examples(BATCH_EXAMPLES),
+    response_model=None,
+    responses={200: {"model": BatchResponse}},
+    summary="Resolver una EDO para varias condiciones iniciales",
+    description=(
+        "Integra y' = f(t, y) con Euler y RK4 para una lista de condiciones iniciales "
+        "en una sola llamada: con un kernel compilado por Numba, o todas a la vez "
+        "con operaciones vectorizadas de NumPy."
+    ),
+)
+async def solve_batch(request: BatchRequest):
+    """
+    Calcula Euler y RK4 para todas las condiciones iniciales en una sola llamada.
+    """
+    return await run_in_solver_pool(_solve_batch, request)
@@ -1,106 +1,315 @@
 # app/api/v1/routes_errors.py
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from app.models.ode_requests import ErrorAnalysisRequest
 from app.models.ode_responses import ErrorAnalysisResponse
-from app.core.parser import parse_rhs
-from app.services.euler_solver import euler_solver
-from app.services.rk4_solver import rk4_solver
-from app.services.analytic_solver import analytic_solver
-from app.services.error_metrics import absolute_errors, summary_error_metrics
+from app.models.examples import ODE_EXAMPLES, request_examples
+from app.core.executor import run_in_solver_pool
+from app.core.responses import orjson_response
+from app.core.grid import build_time_grid
+from app.core.jit import is_jitted
+from app.core.timing import timed_call
+from app.core.parser import linear_coefficient, parse_rhs
+from app.services.analytic_solver import analytic_solution
+from app.services.error_metrics import error_matrix
+from app.services.methods import METHODS
 
 router = APIRouter()
 
+# Puntos por línea en /solve.ndjson
+_NDJSON_CHUNK = 4096
 
-def _run_full_solve(request: ErrorAnalysisRequest) -> ErrorAnalysisResponse:
+
+async def _in_pool(func: Callable[..., Any], *args: Any) -> Any:
     """
-    Lógica central que:
-      - Ejecuta Euler
-      - Ejecuta RK4
-      - Intenta resolver analíticamente
-      - Calcula errores y métricas
+    Ejecuta un paso de la comparación en el pool de cálculo y traduce sus errores
+    a HTTPException (422 para entradas inválidas, 500 para el resto).
     """
     try:
-        f_sym, f_num = parse_rhs(request.f)
+        return await run_in_solver_pool(func, *args)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        # Lo relanzamos tal cual
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno en comparación: {e}")
 
-        # Euler
-        grid_e, y_euler = euler_solver(f_num, request.t0, request.y0, request.T, request.h)
 
-        # RK4 (mismo grid por construcción)
-        grid_rk, y_rk4 = rk4_solver(f_num, request.t0, request.y0, request.T, request.h)
+def _prepare(request: ErrorAnalysisRequest) -> Tuple[Any, Any, np.ndarray, Any]:
+    """
+    Parsea f(t, y) y construye el grid una sola vez (compartido por todos los métodos).
+    """
+    f_sym, f_num = parse_rhs(request.f)
+    grid = build_time_grid(request.t0, request.T, request.h)
+    lam = linear_coefficient(f_sym)
+    return f_sym, f_num, grid, None if lam is None else float(lam)
 
-        if len(grid_e) != len(grid_rk):
-            raise RuntimeError("Los grids de Euler y RK4 no coinciden, revise build_time_grid.")
 
-        # Analítico
-        grid_a, exact_values, meta_analytic = analytic_solver(
-            f_sym, request.t0, request.y0, request.T, request.h
-        )
+def _solve_methods(
+    f_num: Any, grid: np.ndarray, y0: float, lam: Any
+) -> List[Tuple[np.ndarray, float]]:
+    """
+    Ejecuta todos los métodos registrados, uno tras otro, en el hilo actual.
+    Devuelve (y_n, tiempo en ms) por método.
+    """
+    return [timed_call(spec.solver, f_num, grid, y0, lam) for spec in METHODS.values()]
 
-        if len(grid_e) != len(grid_a):
-            raise RuntimeError("El grid analítico no coincide con los numéricos, revise build_time_grid.")
 
-        # Errores punto a punto
-        errors_euler = absolute_errors(y_euler, exact_values)
-        errors_rk4 = absolute_errors(y_rk4, exact_values)
+async def _skip_analytic() -> Tuple[None, Dict[str, Any]]:
+    """
+    Resultado analítico vacío para el modo 'entre_metodos' (no se llama a SymPy).
+    """
+    return None, {
+        "ode_simplified": None,
+        "exact_solution_latex": None,
+        "analytic_status": "skipped",
+    }
 
-        # Métricas resumen
-        metrics_euler = summary_error_metrics(y_euler, exact_values)
-        metrics_rk4 = summary_error_metrics(y_rk4, exact_values)
 
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
-    except HTTPException:
-        # Lo relanzamos tal cual
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error interno en comparación: {e}")
+def _between_methods(
+    names: Tuple[str, ...], results: List[np.ndarray]
+) -> Optional[Dict[str, Any]]:
+    """
+    Compara cada método contra el de mayor orden del registro (max y RMSE de la diferencia).
+    Con un solo método registrado no hay nada que comparar y devuelve None.
+    """
+    if len(names) < 2:
+        return None
+    ref = max(range(len(names)), key=lambda i: METHODS[names[i]].order)
+    _, max_err, rmse = error_matrix(np.stack(results), results[ref])
+    return {
+        "reference": names[ref],
+        "metrics": {
+            name: _metric_values(max_err[i], rmse[i])
+            for i, name in enumerate(names) if i != ref
+        },
+    }
+
+
+def _metric_values(max_err: float, rmse: float) -> Dict[str, Any]:
+    # NaN: el método no tiene puntos comparables con la solución exacta
+    if np.isnan(rmse):
+        return {"max": None, "rmse": None}
+    return {"max": float(max_err), "rmse": float(rmse)}
+
+
+def _output_array(values: Optional[np.ndarray], precision: str) -> Optional[np.ndarray]:
+    """
+    Arreglo tal como va en la respuesta: float64, o float32 si se pidió 'f32'.
+    """
+    if values is None or precision == "f64":
+        return values
+    return values.astype(np.float32)
+
+
+async def _compute_full_solve(request: ErrorAnalysisRequest) -> Dict[str, Any]:
+    """
+    Lógica central que:
+      - Construye el grid una sola vez (compartido por todos los métodos)
+      - Resuelve analíticamente y con cada método registrado en paralelo (tareas
+        independientes en el pool; los kernels de Numba liberan el GIL). Sin
+        Numba los métodos van juntos en una sola tarea, que es más barato.
+      - Calcula errores y métricas resumen sobre los arreglos resultantes
+      - Recién al final pasa los arreglos a la precisión pedida para la respuesta
+    """
+    f_sym, f_num, grid, lam = await _in_pool(_prepare, request)
+
+    names = tuple(METHODS)
+    parallel = is_jitted(f_num)
+    if parallel:
+        method_tasks = [
+            _in_pool(timed_call, spec.solver, f_num, grid, request.y0, lam)
+            for spec in METHODS.values()
+        ]
+    else:
+        # En Python puro los hilos no corren en paralelo: una sola tarea para todos
+        method_tasks = [_in_pool(_solve_methods, f_num, grid, request.y0, lam)]
+
+    if request.comparison_mode == "contra_analitica":
+        analytic_task = _in_pool(
+            analytic_solution, f_sym, request.t0, request.T, request.h, request.y0
+        )
+    else:
+        analytic_task = _skip_analytic()
+
+    (exact_values, meta_analytic), *results = await asyncio.gather(
+        analytic_task,
+        *method_tasks,
+    )
+    if not parallel:
+        results = results[0]
+    compute_time_ms = {name: ms for name, (_, ms) in zip(names, results)}
+    results = [y for y, _ in results]
+
+    # Errores y métricas de todos los métodos en una sola pasada sobre la matriz (M, N)
+    matrix = error_matrix(np.stack(results), exact_values)
+    best_method = None
+    if matrix is None:
+        errors = {name: None for name in names}
+        error_metrics = {name: None for name in names}
+    else:
+        errs, max_err, rmse = matrix
+        errors = {name: errs[i] for i, name in enumerate(names)}
+        error_metrics = {
+            name: _metric_values(max_err[i], rmse[i]) for i, name in enumerate(names)
+        }
+        # Método con menor RMSE (los NaN van al final del orden)
+        if not np.all(np.isnan(rmse)):
+            best_method = names[int(np.argmin(np.where(np.isnan(rmse), np.inf, rmse)))]
+
+    between_methods = None
+    if request.comparison_mode == "entre_metodos":
+        between_methods = _between_methods(names, results)
 
     meta = {
         "ode_simplified": meta_analytic.get("ode_simplified"),
         "exact_solution_latex": meta_analytic.get("exact_solution_latex"),
         "analytic_status": meta_analytic.get("analytic_status"),
-        "convergence_order_euler": 1,
-        "convergence_order_rk4": 4,
+        **{f"convergence_order_{name}": spec.order for name, spec in METHODS.items()},
+        "best_method": best_method,
+        "comparison_mode": request.comparison_mode,
+        "between_methods": between_methods,
     }
+    if request.include_timing:
+        meta["compute_time_ms"] = compute_time_ms
 
-    return ErrorAnalysisResponse(
-        grid=grid_e,
-        euler=y_euler,
-        rk4=y_rk4,
-        exact=exact_values,
-        errors={
-            "euler": errors_euler,
-            "rk4": errors_rk4
-        },
-        error_metrics={
-            "euler": metrics_euler,
-            "rk4": metrics_rk4
-        },
-        meta=meta
+    precision = request.response_precision
+    return {
+        "grid": _output_array(grid, precision),
+        **{name: _output_array(y, precision) for name, y in zip(names, results)},
+        "exact": _output_array(exact_values, precision),
+        "errors": {name: _output_array(err, precision) for name, err in errors.items()},
+        "error_metrics": error_metrics,
+        "meta": meta,
+    }
+
+
+def _binary_response(result: Dict[str, Any]) -> Response:
+    """
+    Comparación completa en formato binario:
+      - una línea JSON de cabecera (terminada en salto de línea) con n, dtype, el orden
+        de los arreglos, métricas y meta
+      - a continuación, los arreglos little-endian (float64, o float32 si se pidió
+        'f32') de n valores cada uno,
+        concatenados en el orden indicado por la cabecera
+    Los arreglos ausentes (exact y errores si no hay solución analítica) se omiten.
+    """
+    arrays = [("grid", result["grid"])] + [(name, result[name]) for name in METHODS]
+    if result["exact"] is not None:
+        arrays.append(("exact", result["exact"]))
+    for name, err in result["errors"].items():
+        if err is not None:
+            arrays.append((f"error_{name}", err))
+
+    dtype = "<f4" if result["grid"].dtype == np.float32 else "<f8"
+    header = {
+        "n": int(result["grid"].shape[0]),
+        "dtype": dtype,
+        "arrays": [name for name, _ in arrays],
+        "error_metrics": result["error_metrics"],
+        "meta": result["meta"],
+    }
+    body = b"".join(np.asarray(values, dtype=dtype).tobytes() for _, values in arrays)
+
+    return Response(
+        content=orjson.dumps(header) + b"\n" + body,
+        media_type="application/octet-stream",
     )
 
 
+def _iter_ndjson(result: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Genera la comparación completa como NDJSON:
+      - primera línea: cabecera con n, nombres de los arreglos, métricas y meta
+      - siguientes líneas: bloques de hasta _NDJSON_CHUNK puntos con "offset"
+        y un tramo de cada arreglo
+    """
+    arrays = [("grid", result["grid"])] + [(name, result[name]) for name in METHODS]
+    if result["exact"] is not None:
+        arrays.append(("exact", result["exact"]))
+    for name, err in result["errors"].items():
+        if err is not None:
+            arrays.append((f"error_{name}", err))
+
+    n = int(result["grid"].shape[0])
+    header = {
+        "n": n,
+        "arrays": [name for name, _ in arrays],
+        "error_metrics": result["error_metrics"],
+        "meta": result["meta"],
+    }
+    yield orjson.dumps(header) + b"\n"
+
+    for start in range(0, n, _NDJSON_CHUNK):
+        stop = start + _NDJSON_CHUNK
+        chunk = {"offset": start}
+        for name, values in arrays:
+            chunk[name] = values[start:stop]
+        yield orjson.dumps(chunk, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+
+
 @router.post(
     "/errors",
-    response_model=ErrorAnalysisResponse,
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_model=None,
+    responses={200: {"model": ErrorAnalysisResponse}},
     summary="Comparar métodos y calcular errores",
     description=(
         "Calcula la solución aproximada por Euler y RK4, intenta obtener la solución analítica "
         "y devuelve los errores absolutos |y_num - y_exact| y métricas de error (máximo y RMSE)."
     ),
 )
-def compare_methods_and_errors(request: ErrorAnalysisRequest):
-    return _run_full_solve(request)
+async def compare_methods_and_errors(request: ErrorAnalysisRequest):
+    return orjson_response(await _compute_full_solve(request))
 
 
 @router.post(
     "/solve",
-    response_model=ErrorAnalysisResponse,
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_model=None,
+    responses={200: {"model": ErrorAnalysisResponse}},
     summary="Resolver EDO y obtener comparación completa (endpoint único)",
     description=(
         "Endpoint único pensado para el frontend: ejecuta Euler, RK4, intenta resolver analíticamente "
         "y devuelve soluciones, errores y métricas resumen en una sola respuesta."
     ),
 )
-def solve_all(request: ErrorAnalysisRequest):
-    return _run_full_solve(request)
+async def solve_all(request: ErrorAnalysisRequest):
+    return orjson_response(await _compute_full_solve(request))
+
+
+@router.post(
+    "/solve.bin",
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_class=Response,
+    summary="Comparación completa en formato binario (N grande)",
+    description=(
+        "Mismo cálculo que /solve, pero devuelve una cabecera JSON de una línea seguida de "
+        "los arreglos como float64 (o float32) little-endian. Pensado para grids grandes: evita formatear "
+        "miles de floats como texto (en el cliente: new Float64Array(buffer, offset))."
+    ),
+)
+async def solve_all_binary(request: ErrorAnalysisRequest):
+    return _binary_response(await _compute_full_solve(request))
+
+
+@router.post(
+    "/solve.ndjson",
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_class=StreamingResponse,
+    summary="Comparación completa en streaming (NDJSON)",
+    description=(
+        "Mismo cálculo que /solve, enviado como JSON Lines: una cabecera con métricas y meta, "
+        "y luego bloques de puntos con su offset. El cliente puede empezar a graficar antes "
+        "de recibir toda la respuesta."
+    ),
+)
+async def solve_all_ndjson(request: ErrorAnalysisRequest):
+    # La serialización ocurre bloque a bloque mientras se envía
+    result = await _compute_full_solve(request)
+    return StreamingResponse(_iter_ndjson(result), media_type="application/x-ndjson")
@@ -1,40 +1,56 @@
 # app/api/v1/routes_euler.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from app.models.ode_requests import ODEBaseRequest
 from app.models.ode_responses import EulerResponse
-from app.core.parser import parse_rhs
+from app.models.examples import ODE_EXAMPLES, request_examples
+from app.core.executor import run_in_solver_pool
+from app.core.responses import orjson_response
+from app.core.grid import build_time_grid
+from app.core.timing import timed_call
+from app.core.parser import linear_coefficient, parse_rhs
 from app.services.euler_solver import euler_solver
 
 router = APIRouter()
 
 
-@router.post(
-    "/euler",
-    response_model=EulerResponse,
-    summary="Resolver EDO con método de Euler",
-    description=(
-        "Resuelve una ecuación diferencial ordinaria de primer orden de la forma "
-        "y' = f(t, y) usando el método de Euler explícito."
-    ),
-)
-def solve_euler(request: ODEBaseRequest):
+def _solve_euler(request: ODEBaseRequest) -> Response:
     """
-    Calcula la solución numérica usando Euler.
+    Lógica de /euler (se ejecuta en el pool de cálculo).
     """
     try:
         f_sym, f_num = parse_rhs(request.f)
-        grid, y_values = euler_solver(f_num, request.t0, request.y0, request.T, request.h)
+        grid = build_time_grid(request.t0, request.T, request.h)
+        lam = linear_coefficient(f_sym)
+        y_values, compute_time_ms = timed_call(
+            euler_solver, f_num, grid, request.y0, None if lam is None else float(lam)
+        )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno en Euler: {e}")
 
     meta = {
-        "convergence_order": 1,
+        "convergence_order": 1.0,
     }
+    if request.include_timing:
+        meta["compute_time_ms"] = compute_time_ms
+
+    return orjson_response({"grid": grid, "euler": y_values, "meta": meta})
+
 
-    return EulerResponse(
-        grid=grid,
-        euler=y_values,
-        meta=meta
-    )
+@router.post(
+    "/euler",
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_model=None,
+    responses={200: {"model": EulerResponse}},
+    summary="Resolver EDO con método de Euler",
+    description=(
+        "Resuelve una ecuación diferencial ordinaria de primer orden de la forma "
+        "y' = f(t, y) usando el método de Euler explícito."
+    ),
+)
+async def solve_euler(request: ODEBaseRequest):
+    """
+    Calcula la solución numérica usando Euler.
+    """
+    return await run_in_solver_pool(_solve_euler, request)
@@ -1,41 +1,57 @@
 # app/api/v1/routes_rk4.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from app.models.ode_requests import ODEBaseRequest
 from app.models.ode_responses import RK4Response
-from app.core.parser import parse_rhs
+from app.models.examples import ODE_EXAMPLES, request_examples
+from app.core.executor import run_in_solver_pool
+from app.core.responses import orjson_response
+from app.core.grid import build_time_grid
+from app.core.timing import timed_call
+from app.core.parser import linear_coefficient, parse_rhs
 from app.services.rk4_solver import rk4_solver
 
 
 router = APIRouter()
 
 
-@router.post(
-    "/rk4",
-    response_model=RK4Response,
-    summary="Resolver EDO con método de Runge-Kutta RK4",
-    description=(
-        "Resuelve una ecuación diferencial ordinaria de primer orden de la forma "
-        "y' = f(t, y) usando el método clásico de Runge-Kutta de orden 4."
-    ),
-)
-def solve_rk4(request: ODEBaseRequest):
+def _solve_rk4(request: ODEBaseRequest) -> Response:
     """
-    Calcula la solución numérica usando RK4.
+    Lógica de /rk4 (se ejecuta en el pool de cálculo).
     """
     try:
         f_sym, f_num = parse_rhs(request.f)
-        grid, y_values = rk4_solver(f_num, request.t0, request.y0, request.T, request.h)
+        grid = build_time_grid(request.t0, request.T, request.h)
+        lam = linear_coefficient(f_sym)
+        y_values, compute_time_ms = timed_call(
+            rk4_solver, f_num, grid, request.y0, None if lam is None else float(lam)
+        )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno en RK4: {e}")
 
     meta = {
-        "convergence_order": 4,
+        "convergence_order": 4.0,
     }
+    if request.include_timing:
+        meta["compute_time_ms"] = compute_time_ms
+
+    return orjson_response({"grid": grid, "rk4": y_values, "meta": meta})
+
 
-    return RK4Response(
-        grid=grid,
-        rk4=y_values,
-        meta=meta
-    )
+@router.post(
+    "/rk4",
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_model=None,
+    responses={200: {"model": RK4Response}},
+    summary="Resolver EDO con método de Runge-Kutta RK4",
+    description=(
+        "Resuelve una ecuación diferencial ordinaria de primer orden de la forma "
+        "y' = f(t, y) usando el método clásico de Runge-Kutta de orden 4."
+    ),
+)
+async def solve_rk4(request: ODEBaseRequest):
+    """
+    Calcula la solución numérica usando RK4.
+    """
+    return await run_in_solver_pool(_solve_rk4, request)
@@ -0,0 +1,59 @@
+# app/api/v1/routes_rk45.py
+from fastapi import APIRouter, HTTPException, Response
+from app.models.ode_requests import AdaptiveRequest
+from app.models.ode_responses import RK45Response
+from app.models.examples import ODE_EXAMPLES, request_examples
+from app.core.executor import run_in_solver_pool
+from app.core.responses import orjson_response
+from app.core.timing import timed_call
+from app.core.parser import parse_rhs
+from app.services.rkck_solver import rkck_solver
+
+
+router = APIRouter()
+
+
+def _solve_rk45(request: AdaptiveRequest) -> Response:
+    """
+    Lógica de /rk45 (se ejecuta en el pool de cálculo).
+    """
+    try:
+        _, f_num = parse_rhs(request.f)
+        (grid, y_values, rejected), compute_time_ms = timed_call(
+            rkck_solver, f_num, request.t0, request.T, request.y0, request.h, request.tol
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno en RK45: {e}")
+
+    meta = {
+        "convergence_order": 5.0,
+        "accepted_steps": len(grid) - 1,
+        "rejected_steps": rejected,
+        "tol": request.tol,
+    }
+    if request.include_timing:
+        meta["compute_time_ms"] = compute_time_ms
+
+    return orjson_response({"grid": grid, "rk45": y_values, "meta": meta})
+
+
+@router.post(
+    "/rk45",
+    openapi_extra=request_examples(ODE_EXAMPLES),
+    response_model=None,
+    responses={200: {"model": RK45Response}},
+    summary="Resolver EDO con Runge-Kutta adaptativo RK45 (Cash-Karp)",
+    description=(
+        "Resuelve y' = f(t, y) con el método embebido RK4(5) de Cash-Karp. "
+        "h es el paso inicial: el método lo ajusta en cada paso según la "
+        "tolerancia, con pasos largos en las zonas suaves y cortos donde la "
+        "solución cambia rápido."
+    ),
+)
+async def solve_rk45(request: AdaptiveRequest):
+    """
+    Calcula la solución numérica usando RK45 adaptativo.
+    """
+    return await run_in_solver_pool(_solve_rk45, request)
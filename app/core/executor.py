@@ -0,0 +1,22 @@
+# app/core/executor.py
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+# Pool dedicado a los métodos numéricos: un request largo de /solve no compite
+# con el pool por defecto de FastAPI. Los kernels de Numba se compilan con
+# nogil=True, así que los hilos corren en paralelo en varios núcleos.
+_SOLVE_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="ode-solver",
+)
+
+
+async def run_in_solver_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Ejecuta func(*args) en el pool de cálculo sin bloquear el event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_SOLVE_POOL, partial(func, *args))
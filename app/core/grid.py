@@ -1,30 +1,40 @@
 # app/core/grid.py
-from typing import List
+import math
+import os
+import numpy as np
 
+# Máximo de puntos por grid (configurable con la variable de entorno ODE_MAX_POINTS)
+MAX_POINTS = int(os.environ.get("ODE_MAX_POINTS", "5000"))
 
-def build_time_grid(t0: float, T: float, h: float, max_points: int = 5000) -> List[float]:
-    if h <= 0:
-        raise ValueError("El paso h debe ser positivo.")
-    if T <= t0:
-        raise ValueError("Se requiere T > t0 para construir el intervalo.")
 
-    n_estimated = int((T - t0) / h) + 2  # +2 por seguridad
+def check_grid_size(t0: float, T: float, h: float, max_points: int = MAX_POINTS) -> None:
+    """
+    Verifica, sin reservar memoria, que el grid de [t0, T] con paso h no supere
+    max_points. Lanza ValueError si h es tan chico que el grid sería enorme.
+    """
+    # En float: con h diminuto el cociente puede ser inf y no cabe en un int
+    n_estimated = (T - t0) / h + 2  # +2 por seguridad
     if n_estimated > max_points:
+        shown = f"{n_estimated:.0f}" if math.isfinite(n_estimated) else "demasiados"
         raise ValueError(
-            f"El número de puntos estimado ({n_estimated}) excede el máximo permitido ({max_points}). "
+            f"El número de puntos estimado ({shown}) excede el máximo permitido ({max_points}). "
             f"Reduce el intervalo o aumenta h."
         )
 
-    grid = []
-    t = t0
-    # Usamos una pequeña tolerancia para incluir T
-    T_tol = T + 1e-12
-    while t < T_tol:
-        grid.append(t)
-        t += h
-
-    # Ajustar el último valor al T exacto si quedó muy cerca
-    if abs(grid[-1] - T) > 1e-8:
-        grid.append(T)
+
+def build_time_grid(t0: float, T: float, h: float, max_points: int = MAX_POINTS) -> np.ndarray:
+    if h <= 0:
+        raise ValueError("El paso h debe ser positivo.")
+    if T <= t0:
+        raise ValueError("Se requiere T > t0 para construir el intervalo.")
+
+    check_grid_size(t0, T, h, max_points)
+
+    # t_n = t0 + n*h evita acumular error de redondeo con t += h.
+    # n es el número de pasos necesarios para llegar (o pasar) a T; el último
+    # punto se fija a T, así que si T no cae en la malla el último paso es más corto.
+    n_steps = max(int(math.ceil((T - t0) / h - 1e-9)), 1)
+    grid = t0 + h * np.arange(n_steps + 1, dtype=np.float64)
+    grid[-1] = T
 
     return grid
@@ -0,0 +1,62 @@
+# app/core/jit.py
+"""
+Punto único de acceso a Numba.
+
+Si Numba no está instalado, `njit` y `jitable` se convierten en decoradores que
+no hacen nada y el resto de la aplicación sigue funcionando en Python puro.
+"""
+try:
+    from numba import njit, types
+    from numba.core.registry import CPUDispatcher
+    from numba.extending import register_jitable as jitable
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depende del entorno
+    types = None
+    CPUDispatcher = None
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Igual que en Numba, la función original queda accesible en .py_func
+        def decorator(func):
+            func.py_func = func
+            return func
+
+        # Uso directo: @njit
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return decorator(args[0])
+
+        # Uso con argumentos: @njit(sig, cache=True, ...)
+        return decorator
+
+    def jitable(func):
+        # Sin Numba, una función auxiliar de los kernels es una función normal
+        return func
+
+
+if NUMBA_AVAILABLE:
+    # Firma de la función f(t, y) -> float usada por los métodos numéricos.
+    RHS_SIG = types.float64(types.float64, types.float64)
+    RHS_TYPE = types.FunctionType(RHS_SIG)
+    # Firma de los kernels de integración: (f, grid, y0) -> y
+    SOLVER_SIG = types.float64[::1](RHS_TYPE, types.float64[::1], types.float64)
+    # Firma de los kernels por lote: (f, grid, y0s) -> Y con forma (B, n)
+    BATCH_SIG = types.float64[:, ::1](RHS_TYPE, types.float64[::1], types.float64[::1])
+    # Firma del kernel adaptativo: (f, t0, T, y0, h0, tol, max_points) -> (t, y, rechazos)
+    ADAPTIVE_SIG = types.Tuple((types.float64[::1], types.float64[::1], types.int64))(
+        RHS_TYPE, types.float64, types.float64, types.float64, types.float64,
+        types.float64, types.int64,
+    )
+    # Firma del kernel de errores: (approx (M, n), exact) -> (errores, max, rmse)
+    ERRORS_SIG = types.Tuple((types.float64[:, ::1], types.float64[::1], types.float64[::1]))(
+        types.float64[:, ::1], types.float64[::1]
+    )
+else:  # pragma: no cover - depende del entorno
+    RHS_SIG = RHS_TYPE = SOLVER_SIG = BATCH_SIG = ADAPTIVE_SIG = ERRORS_SIG = None
+
+
+def is_jitted(func) -> bool:
+    """
+    Indica si `func` fue compilada con Numba y puede pasarse a un kernel @njit.
+    """
+    return NUMBA_AVAILABLE and isinstance(func, CPUDispatcher)
@@ -1,14 +1,189 @@
 # app/core/parser.py
-from typing import Callable, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+import hashlib
+import importlib.util
+import math
+import os
+import re
+import sys
+import threading
+import numpy as np
 import sympy as sp
+from sympy.parsing.sympy_parser import convert_xor, parse_expr, standard_transformations
+from app.core.jit import NUMBA_AVAILABLE, RHS_SIG, njit
 
 
-def parse_rhs(expr_str: str) -> Tuple[sp.Expr, Callable[[float, float], float]]:
+# Validación previa del texto: solo números, nombres, operadores y paréntesis.
+# El punto solo se admite entre dígitos (decimales): nada de atributos como y.func.
+_MAX_EXPR_LENGTH = 500
+_EXPR_PATTERN = re.compile(r"(?:[\w\s+\-*/^(),]|(?<=\d)\.(?=\d))*")
+
+# Límites para potencias con exponente numérico: SymPy calcula de forma exacta
+# las potencias de números (ej: 9**9**9) y puede no terminar nunca.
+_MAX_EXPONENT = 100
+_MAX_POWER_DIGITS = 300
+
+# Nombres que necesitan las transformaciones de parse_expr (Add, Mul y Pow para
+# evaluate=False); nada más del espacio de nombres de SymPy (ni de Python) queda accesible.
+_PARSER_GLOBALS = {
+    "Integer": sp.Integer,
+    "Float": sp.Float,
+    "Rational": sp.Rational,
+    "Symbol": sp.Symbol,
+    "Add": sp.Add,
+    "Mul": sp.Mul,
+    "Pow": sp.Pow,
+}
+_PARSER_TRANSFORMATIONS = standard_transformations + (convert_xor,)
+
+# Funciones f(t, y) ya compiladas, indexadas por hash del código generado.
+# _RHS_LOCK protege los diccionarios; cada clave tiene su propio lock para que
+# expresiones distintas se compilen sin esperarse entre sí.
+_RHS_REGISTRY: Dict[str, Callable[[float, float], float]] = {}
+_RHS_KEY_LOCKS: Dict[str, threading.Lock] = {}
+_RHS_LOCK = threading.Lock()
+
+# Carpeta donde se escriben los módulos generados; Numba guarda junto a ellos
+# (o en NUMBA_CACHE_DIR) el código compilado, que sobrevive a reinicios.
+# Por defecto es privada del usuario: lo que hay en ella se importa y ejecuta.
+_RHS_CACHE_DIR = os.environ.get(
+    "ODE_RHS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ode_rhs")
+)
+
+_RHS_MODULE_TEMPLATE = """\
+import math
+from app.core.jit import RHS_SIG, njit
+
+
+@njit(RHS_SIG, cache=True, fastmath=True)
+def f(t, y):
+{body}
+"""
+
+
+def _rhs_body(f_sym: sp.Expr) -> str:
     """
-    Parsea la expresión f(t, y) dada como string usando SymPy
-    y devuelve:
-      - f_sym: expresión simbólica
-      - f_num: función numérica f(t, y) para usar en los métodos numéricos.
+    Cuerpo en Python de f(t, y). Las subexpresiones repetidas (ej: t*y en
+    sin(t*y) + cos(t*y)) se calculan una sola vez en variables auxiliares (sp.cse).
+    """
+    replacements, (reduced,) = sp.cse(f_sym, symbols=sp.numbered_symbols("_c"))
+    lines = [f"    {sym} = {sp.pycode(expr)}" for sym, expr in replacements]
+    lines.append(f"    return {sp.pycode(reduced)}")
+    return "\n".join(lines)
+
+
+def _private_cache_dir() -> str:
+    """
+    Crea (con permisos 0700) la carpeta de caché y verifica que pertenezca al
+    usuario actual y que nadie más pueda escribir en ella. Lanza OSError si no.
+    """
+    os.makedirs(_RHS_CACHE_DIR, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        st = os.stat(_RHS_CACHE_DIR)
+        if st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise OSError(f"La carpeta de caché {_RHS_CACHE_DIR} no es privada del usuario.")
+    return _RHS_CACHE_DIR
+
+
+def _load_rhs_module(key: str, body: str) -> Callable[[float, float], float]:
+    """
+    Escribe f(t, y) como módulo en disco y lo importa. Al tener archivo fuente,
+    Numba puede usar cache=True y reutilizar la compilación entre reinicios.
+    Un archivo existente solo se reutiliza si su contenido es exactamente el esperado.
+    """
+    source = _RHS_MODULE_TEMPLATE.format(body=body)
+    path = os.path.join(_private_cache_dir(), f"rhs_{key}.py")
+    try:
+        with open(path, encoding="utf-8") as fh:
+            current = fh.read()
+    except FileNotFoundError:
+        current = None
+    if current != source:
+        # Escritura atómica: otro proceso puede estar leyendo el mismo archivo
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(source)
+        os.replace(tmp_path, path)
+
+    spec = importlib.util.spec_from_file_location(f"_ode_rhs_{key}", path)
+    module = importlib.util.module_from_spec(spec)
+    # Numba vuelve a importar el módulo por nombre al cargar su caché
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module.f
+
+
+def _exec_rhs(body: str) -> Callable[[float, float], float]:
+    """
+    Compila f(t, y) en memoria (sin caché en disco).
+    """
+    src = f"def _f(t, y):\n{body}\n"
+    namespace = {"math": math}
+    exec(src, namespace)
+    return njit(RHS_SIG, fastmath=True)(namespace["_f"])
+
+
+def _compile_rhs(body: str) -> Callable[[float, float], float]:
+    """
+    Compila con Numba el código Python de f(t, y) generado por SymPy.
+    Cada código distinto se compila una sola vez por proceso (registro + lock
+    por clave) y, si la carpeta de caché es privada y escribible, una sola vez
+    entre reinicios.
+    """
+    key = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+    with _RHS_LOCK:
+        f_num = _RHS_REGISTRY.get(key)
+        if f_num is not None:
+            return f_num
+        key_lock = _RHS_KEY_LOCKS.setdefault(key, threading.Lock())
+
+    with key_lock:
+        try:
+            f_num = _RHS_REGISTRY.get(key)
+            if f_num is None:
+                try:
+                    f_num = _load_rhs_module(key, body)
+                except OSError:
+                    f_num = _exec_rhs(body)
+                with _RHS_LOCK:
+                    _RHS_REGISTRY[key] = f_num
+        finally:
+            # También si la compilación falla: el lock de la clave no debe quedar colgado
+            with _RHS_LOCK:
+                _RHS_KEY_LOCKS.pop(key, None)
+    return f_num
+
+
+def _check_powers(expr: sp.Expr) -> None:
+    """
+    Recorre la expresión sin evaluar (de las hojas a la raíz) y rechaza las
+    potencias con exponente numérico de más de _MAX_EXPONENT en valor absoluto
+    o cuyo resultado numérico tendría más de _MAX_POWER_DIGITS dígitos.
+    """
+    for node in sp.postorder_traversal(expr):
+        if not isinstance(node, sp.Pow) or not node.exp.is_number:
+            continue
+        try:
+            exp_val = abs(complex(node.exp.evalf()))
+            too_big = exp_val > _MAX_EXPONENT
+            if not too_big and node.base.is_number:
+                base_val = abs(complex(node.base.evalf()))
+                too_big = base_val > 1 and exp_val * math.log10(base_val) > _MAX_POWER_DIGITS
+        except (TypeError, ValueError, OverflowError):
+            too_big = True
+        if too_big:
+            raise ValueError(
+                "La expresión f(t, y) contiene potencias demasiado grandes "
+                f"(exponente máximo {_MAX_EXPONENT})."
+            )
+
+
+@lru_cache(maxsize=512)
+def _parse_rhs_cached(expr_str: str) -> Tuple[sp.Expr, Callable[[float, float], float]]:
+    """
+    Parseo y compilación de f(t, y), cacheados por expresión.
+    Las expresiones de SymPy son inmutables, así que compartirlas entre requests es seguro.
     """
     t = sp.symbols('t')
     y = sp.symbols('y')
@@ -23,6 +198,21 @@ def parse_rhs(expr_str: str) -> Tuple[sp.Expr, Callable[[float, float], float]]:
         "asin": sp.asin,
         "acos": sp.acos,
         "atan": sp.atan,
+        "sinh": sp.sinh,
+        "cosh": sp.cosh,
+        "tanh": sp.tanh,
+        "asinh": sp.asinh,
+        "acosh": sp.acosh,
+        "atanh": sp.atanh,
+        "cot": sp.cot,
+        "sec": sp.sec,
+        "csc": sp.csc,
+        "ln": sp.log,
+        "abs": sp.Abs,
+        "Abs": sp.Abs,
+        "sign": sp.sign,
+        "floor": sp.floor,
+        "ceiling": sp.ceiling,
     }
 
     allowed_symbols = {
@@ -30,18 +220,171 @@ def parse_rhs(expr_str: str) -> Tuple[sp.Expr, Callable[[float, float], float]]:
         "y": y,
     }
 
-    local_dict = {**allowed_symbols, **allowed_functions}
+    allowed_constants = {
+        "pi": sp.pi,
+        "E": sp.E,
+    }
 
-    try:
-        f_sym = sp.sympify(expr_str, locals=local_dict)
-    except Exception as e:
-        raise ValueError(f"No se pudo interpretar la expresión f(t, y): {e}")
+    local_dict = {**allowed_symbols, **allowed_functions, **allowed_constants}
+
+    if len(expr_str) > _MAX_EXPR_LENGTH:
+        raise ValueError(
+            f"La expresión f(t, y) es demasiado larga (máximo {_MAX_EXPR_LENGTH} caracteres)."
+        )
+    if not _EXPR_PATTERN.fullmatch(expr_str) or "__" in expr_str:
+        raise ValueError("La expresión f(t, y) contiene caracteres no permitidos.")
+
+    def parse(evaluate: bool) -> sp.Expr:
+        try:
+            return parse_expr(
+                expr_str,
+                local_dict=local_dict,
+                global_dict={**_PARSER_GLOBALS, "__builtins__": {}},
+                transformations=_PARSER_TRANSFORMATIONS,
+                evaluate=evaluate,
+            )
+        except NameError:
+            # Las transformaciones intentan crear una función desconocida
+            raise ValueError(
+                "La expresión usa una función no permitida. Funciones disponibles: "
+                + ", ".join(allowed_functions) + "."
+            )
+        except Exception as e:
+            raise ValueError(f"No se pudo interpretar la expresión f(t, y): {e}")
+
+    # Primero sin evaluar, para revisar las potencias antes de que SymPy las calcule
+    _check_powers(parse(evaluate=False))
+    f_sym = parse(evaluate=True)
 
     # Verificación básica: que dependa de t y/o y
-    if not f_sym.free_symbols.issubset({t, y}):
+    if f_sym.free_symbols - {t, y}:
         raise ValueError("La expresión solo puede depender de t y y.")
 
     # Función numérica f(t, y)
-    f_num = sp.lambdify((t, y), f_sym, modules="math")
+    f_num = None
+    if NUMBA_AVAILABLE:
+        try:
+            f_num = _compile_rhs(_rhs_body(f_sym))
+        except Exception:
+            # Expresiones que Numba no soporta: usamos la versión en Python puro
+            f_num = None
+    if f_num is None:
+        f_num = sp.lambdify((t, y), f_sym, modules="math", cse=True)
 
     return f_sym, f_num
+
+
+# Formas frecuentes de f(t, y), escritas a mano y compiladas al importar: no
+# pasan por parse_expr ni por la generación de código. La clave es el texto
+# sin espacios.
+@njit(RHS_SIG, cache=True, fastmath=True)
+def _rhs_y(t, y):
+    return y
+
+
+@njit(RHS_SIG, cache=True, fastmath=True)
+def _rhs_neg_y(t, y):
+    return -y
+
+
+@njit(RHS_SIG, cache=True, fastmath=True)
+def _rhs_t_y(t, y):
+    return t * y
+
+
+@njit(RHS_SIG, cache=True, fastmath=True)
+def _rhs_logistic(t, y):
+    return y * (1.0 - y)
+
+
+@njit(RHS_SIG, cache=True, fastmath=True)
+def _rhs_sin_t(t, y):
+    return math.sin(t)
+
+
+@njit(RHS_SIG, cache=True, fastmath=True)
+def _rhs_cos_t(t, y):
+    return math.cos(t)
+
+
+@njit(RHS_SIG, cache=True, fastmath=True)
+def _rhs_sin_t_minus_y(t, y):
+    return math.sin(t) - y
+
+
+_T_SYM = sp.symbols('t')
+_Y_SYM = sp.symbols('y')
+
+_FAST_FORMS: Dict[str, Tuple[sp.Expr, Callable[[float, float], float]]] = {
+    "y": (_Y_SYM, _rhs_y),
+    "-y": (-_Y_SYM, _rhs_neg_y),
+    "t*y": (_T_SYM * _Y_SYM, _rhs_t_y),
+    "y*t": (_T_SYM * _Y_SYM, _rhs_t_y),
+    "y*(1-y)": (_Y_SYM * (1 - _Y_SYM), _rhs_logistic),
+    "sin(t)": (sp.sin(_T_SYM), _rhs_sin_t),
+    "cos(t)": (sp.cos(_T_SYM), _rhs_cos_t),
+    "sin(t)-y": (sp.sin(_T_SYM) - _Y_SYM, _rhs_sin_t_minus_y),
+}
+
+
+def parse_rhs(expr_str: str) -> Tuple[sp.Expr, Callable[[float, float], float]]:
+    """
+    Parsea la expresión f(t, y) dada como string usando SymPy
+    y devuelve:
+      - f_sym: expresión simbólica
+      - f_num: función numérica f(t, y) para usar en los métodos numéricos
+        (compilada con Numba si está disponible).
+
+    Los espacios se normalizan antes de consultar la caché, de modo que
+    't*y + 2' y 't*y  +  2' comparten resultado. Las formas más comunes
+    (_FAST_FORMS) se resuelven sin parsear.
+    """
+    fast = _FAST_FORMS.get("".join(expr_str.split()))
+    if fast is not None:
+        return fast
+    return _parse_rhs_cached(" ".join(expr_str.split()))
+
+
+@lru_cache(maxsize=512)
+def vectorize_rhs(f_sym: sp.Expr) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """
+    Versión de f(t, y) con backend NumPy para evaluar sobre arreglos completos
+    (varias trayectorias, residuos, gráficos) en una sola llamada.
+    El resultado siempre tiene la forma de broadcast(t, y), incluso si f es constante.
+    """
+    t = sp.symbols('t')
+    y = sp.symbols('y')
+    f_raw = sp.lambdify((t, y), f_sym, modules="numpy")
+
+    def f_vec(t_val, y_val):
+        shape = np.broadcast(t_val, y_val).shape
+        return np.broadcast_to(np.asarray(f_raw(t_val, y_val), dtype=np.float64), shape)
+
+    return f_vec
+
+
+def linear_coefficient(f_sym: sp.Expr) -> Optional[sp.Expr]:
+    """
+    Si f(t, y) = λ·y con λ constante real, devuelve λ (número de SymPy);
+    en otro caso devuelve None. Permite usar la solución cerrada y0·exp(λ(t - t0)).
+    Es el caso b = 0 de affine_coefficients.
+    """
+    coeffs = affine_coefficients(f_sym)
+    if coeffs is None or coeffs[1] != 0:
+        return None
+    return coeffs[0]
+
+
+def affine_coefficients(f_sym: sp.Expr) -> Optional[Tuple[sp.Expr, sp.Expr]]:
+    """
+    Si f(t, y) = a·y + b con a y b constantes reales, devuelve (a, b);
+    en otro caso devuelve None. Incluye y' = λy (b = 0) y y' = b (a = 0).
+    """
+    y = sp.symbols('y')
+    a = sp.expand(sp.diff(f_sym, y))
+    if a.free_symbols or not a.is_real:
+        return None
+    b = sp.expand(f_sym - a * y)
+    if b.free_symbols or not b.is_real:
+        return None
+    return a, b
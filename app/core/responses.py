@@ -0,0 +1,17 @@
+# app/core/responses.py
+from typing import Any
+import orjson
+from fastapi import Response
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_response(content: Any) -> Response:
+    """
+    Respuesta JSON serializada con orjson: los arreglos de NumPy se escriben
+    directamente (sin pasar por listas de Python) y los NaN quedan como null.
+    """
+    return Response(
+        content=orjson.dumps(content, option=_ORJSON_OPTIONS),
+        media_type="application/json",
+    )
@@ -0,0 +1,14 @@
+# app/core/timing.py
+import time
+from typing import Any, Callable, Tuple
+
+
+def timed_call(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """
+    Ejecuta func(*args) y devuelve (resultado, tiempo en milisegundos).
+    Usa perf_counter_ns: entero, sin redondeo en la diferencia.
+    """
+    start_ns = time.perf_counter_ns()
+    result = func(*args)
+    elapsed_ns = time.perf_counter_ns() - start_ns
+    return result, elapsed_ns / 1_000_000.0
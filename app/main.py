@@ -1,20 +1,81 @@
 # app/main.py
+import asyncio
+import numpy as np
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.v1.routes_euler import router as euler_router
 from app.api.v1.routes_rk4 import router as rk4_router
+from app.api.v1.routes_rk45 import router as rk45_router
 from app.api.v1.routes_analytic import router as analytic_router
 from app.api.v1.routes_errors import router as errors_router
+from app.api.v1.routes_batch import router as batch_router
+from app.core.executor import run_in_solver_pool
+from app.core.grid import build_time_grid
+from app.core.parser import parse_rhs
+from app.services.euler_solver import euler_solver
+from app.services.rk4_solver import rk4_solver
+from app.services.rkck_solver import rkck_solver
+from app.services.batch_solver import euler_ensemble, rk4_ensemble
+from app.services.error_metrics import error_matrix
+from app.models.examples import BATCH_EXAMPLES, ODE_EXAMPLES
+
+
+def _warmup() -> None:
+    """
+    Ejecuta cada método una vez con una EDO trivial para que la compilación
+    (o la carga desde la caché en disco) de Numba ocurra al arrancar y no
+    en el primer request.
+    """
+    try:
+        f_sym, f_num = parse_rhs("y")
+        grid = build_time_grid(0.0, 1.0, 0.1)
+        y_euler = euler_solver(f_num, grid, 1.0)
+        y_rk4 = rk4_solver(f_num, grid, 1.0)
+        rkck_solver(f_num, 0.0, 1.0, 1.0, 0.1)
+        y0s = np.ones(2)
+        euler_ensemble(f_sym, f_num, grid, y0s)
+        rk4_ensemble(f_sym, f_num, grid, y0s)
+        error_matrix(np.stack([y_euler, y_rk4]), np.exp(grid))
+    except Exception:
+        # El warm-up es solo una optimización: la API debe arrancar igual
+        pass
+
+
+def _warm_parse_cache() -> None:
+    """
+    Parsea y compila las f(t, y) de los ejemplos de la documentación, que son
+    las primeras que suele probar un usuario.
+    """
+    for examples in (ODE_EXAMPLES, BATCH_EXAMPLES):
+        for example in examples.values():
+            try:
+                parse_rhs(example["value"]["f"])
+            except Exception:
+                pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _warmup()
+    # Los ejemplos se compilan en segundo plano: la API acepta requests mientras tanto
+    warm_task = asyncio.create_task(run_in_solver_pool(_warm_parse_cache))
+    yield
+    warm_task.cancel()
+
 
 app = FastAPI(
     title="ODE Solver API",
     description=(
         "API para resolver ecuaciones diferenciales de primer orden "
-        "mediante solución analítica, método de Euler y Runge-Kutta RK4."
+        "mediante solución analítica, método de Euler, Runge-Kutta RK4 y RK45 adaptativo."
     ),
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(euler_router, prefix="/api/v1/ode", tags=["Euler"])
 app.include_router(rk4_router, prefix="/api/v1/ode", tags=["RK4"])
+app.include_router(rk45_router, prefix="/api/v1/ode", tags=["RK45 adaptativo"])
 app.include_router(analytic_router, prefix="/api/v1/ode", tags=["Analítica"])
 app.include_router(errors_router, prefix="/api/v1/ode", tags=["Errores / Comparación"])
+app.include_router(batch_router, prefix="/api/v1/ode", tags=["Lote"])
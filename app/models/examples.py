@@ -0,0 +1,34 @@
+# app/models/examples.py
+"""
+Ejemplos de request para la documentación (Swagger UI).
+
+Se adjuntan en cada ruta vía `openapi_extra` en lugar de vivir en los modelos,
+así los modelos de Pydantic quedan livianos y los ejemplos solo se usan al
+generar el esquema OpenAPI.
+"""
+from typing import Any, Dict
+
+ODE_EXAMPLES: Dict[str, Dict[str, Any]] = {
+    "lineal": {
+        "summary": "y' = t·y + 2",
+        "value": {"f": "t*y + 2", "t0": 0.0, "y0": 1.0, "T": 5.0, "h": 0.1},
+    },
+    "rigida": {
+        "summary": "y' = -15·y (rígida suave)",
+        "value": {"f": "-15*y", "t0": 0.0, "y0": 1.0, "T": 0.5, "h": 0.01},
+    },
+}
+
+BATCH_EXAMPLES: Dict[str, Dict[str, Any]] = {
+    "barrido": {
+        "summary": "y' = sin(t) - y con tres condiciones iniciales",
+        "value": {"f": "sin(t) - y", "t0": 0.0, "y0": [0.0, 0.5, 1.0], "T": 5.0, "h": 0.1},
+    },
+}
+
+
+def request_examples(examples: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Devuelve el fragmento de `openapi_extra` que agrega `examples` al cuerpo JSON del request.
+    """
+    return {"requestBody": {"content": {"application/json": {"examples": examples}}}}
@@ -1,31 +1,61 @@
 # app/models/ode_requests.py
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+from app.core.grid import check_grid_size
 
 
-class ODEBaseRequest(BaseModel):
+def _resolve_step(request, check_size: bool = True):
     """
-    Request base para una EDO de primer orden y' = f(t, y).
+    Completa h a partir de n_steps (si se indicó) y, si check_size, valida el
+    tamaño del grid antes de parsear f o reservar memoria.
+    """
+    if (request.h is None) == (request.n_steps is None):
+        raise ValueError("Indica exactamente uno de h o n_steps.")
+    if request.n_steps is not None:
+        if request.T <= request.t0:
+            raise ValueError("Se requiere T > t0 para usar n_steps.")
+        request.h = (request.T - request.t0) / request.n_steps
+    if check_size and request.T > request.t0:
+        check_grid_size(request.t0, request.T, request.h)
+    return request
+
+
+class ODEProblemBase(BaseModel):
+    """
+    Campos comunes a todos los requests: la EDO y' = f(t, y) y el intervalo
+    [t0, T] con su paso. La condición inicial la declara cada request
+    (un valor en ODEBaseRequest, varios en BatchRequest).
     """
     f: str = Field(
         ...,
         description="Expresión de f(t, y) en formato SymPy. Ej: 't*y + 2', 'sin(t) - y'."
     )
     t0: float = Field(..., description="Valor inicial de t (punto de inicio del intervalo).")
-    y0: float = Field(..., description="Condición inicial y(t0) = y0.")
     T: float = Field(..., description="Extremo derecho del intervalo de integración.")
-    h: float = Field(..., gt=0, description="Paso de integración (tamaño de paso).")
+    h: Optional[float] = Field(
+        None, gt=0, description="Paso de integración (tamaño de paso). Alternativa a n_steps."
+    )
+    n_steps: Optional[int] = Field(
+        None, ge=1, description="Número de pasos en [t0, T]; si se indica, h = (T - t0) / n_steps."
+    )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "f": "t*y + 2",
-                "t0": 0.0,
-                "y0": 1.0,
-                "T": 5.0,
-                "h": 0.1
-            }
-        }
+    @model_validator(mode="after")
+    def _check_grid_size(self):
+        return _resolve_step(self)
+
+
+class ODEBaseRequest(ODEProblemBase):
+    """
+    Request base para una EDO de primer orden y' = f(t, y).
+    """
+    y0: float = Field(..., description="Condición inicial y(t0) = y0.")
+    include_timing: bool = Field(
+        False,
+        description=(
+            "Si es true, meta incluye compute_time_ms (tiempo de cálculo de cada método). "
+            "Por defecto no se incluye para que la respuesta sea reproducible."
+        )
+    )
 
 
 class AnalyticRequest(ODEBaseRequest):
@@ -36,11 +66,56 @@ class AnalyticRequest(ODEBaseRequest):
     pass
 
 
+class AdaptiveRequest(ODEBaseRequest):
+    """
+    Request para RK45 adaptativo: h es el paso inicial y el método lo ajusta
+    según la tolerancia.
+    """
+    tol: float = Field(
+        1e-6,
+        gt=0,
+        description="Tolerancia del error local por paso (absoluta si |y| < 1, relativa si no)."
+    )
+
+    @model_validator(mode="after")
+    def _check_grid_size(self):
+        # h es solo el paso inicial: el número de puntos lo acota el propio método
+        return _resolve_step(self, check_size=False)
+
+
 class ErrorAnalysisRequest(ODEBaseRequest):
     """
     Request para el endpoint de errores / comparación.
     Se podría extender (ej: elegir qué métodos comparar),
     pero por ahora usa Euler, RK4 y analítico.
     """
-    # En el futuro aquí podrías activar/desactivar métodos, etc.
-    pass
+    comparison_mode: Literal["contra_analitica", "entre_metodos"] = Field(
+        "contra_analitica",
+        description=(
+            "'contra_analitica': errores de cada método respecto de la solución analítica. "
+            "'entre_metodos': no se resuelve analíticamente; se comparan los métodos "
+            "contra el de mayor orden."
+        )
+    )
+    response_precision: Literal["f64", "f32"] = Field(
+        "f64",
+        description=(
+            "Precisión de los arreglos en la respuesta. Los cálculos y las métricas se "
+            "hacen siempre en float64; 'f32' solo reduce el tamaño de la respuesta "
+            "(suficiente para graficar)."
+        )
+    )
+
+
+class BatchRequest(ODEProblemBase):
+    """
+    Request para resolver la misma EDO con varias condiciones iniciales
+    en una sola llamada (barridos de parámetros, comparaciones en la UI).
+    El grid (h o n_steps) es el mismo para todas las trayectorias.
+    """
+    y0: List[float] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Condiciones iniciales y(t0); se integra una trayectoria por cada valor."
+    )
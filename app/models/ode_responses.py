@@ -2,6 +2,10 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
+# Estos modelos documentan el esquema en OpenAPI. Las rutas serializan los
+# arreglos de NumPy directamente con orjson (datos del propio servidor), sin
+# construir ni validar los modelos en cada respuesta.
+
 
 class EulerResponse(BaseModel):
     grid: List[float] = Field(..., description="Puntos de tiempo t_n.")
@@ -20,6 +24,16 @@ class RK4Response(BaseModel):
         description="Metadatos (ej: orden de convergencia)."
     )
 
+
+class RK45Response(BaseModel):
+    grid: List[float] = Field(..., description="Puntos de tiempo t_n elegidos por el método.")
+    rk45: List[float] = Field(..., description="Aproximaciones y_n obtenidas por RK45 adaptativo.")
+    meta: Dict[str, Any] = Field(
+        ...,
+        description="Metadatos (ej: orden, pasos aceptados y rechazados)."
+    )
+
+
 class AnalyticResponse(BaseModel):
     grid: List[float] = Field(..., description="Puntos de tiempo t_n.")
     exact: Optional[List[float]] = Field(
@@ -52,3 +66,19 @@ class ErrorAnalysisResponse(BaseModel):
         ...,
         description="Información adicional: latex, estado de la solución, orden de métodos, etc."
     )
+
+
+class BatchResponse(BaseModel):
+    grid: List[float] = Field(..., description="Puntos de tiempo t_n.")
+    euler: List[List[float]] = Field(
+        ...,
+        description="Aproximaciones por Euler, una lista por condición inicial."
+    )
+    rk4: List[List[float]] = Field(
+        ...,
+        description="Aproximaciones por RK4, una lista por condición inicial."
+    )
+    meta: Dict[str, Any] = Field(
+        ...,
+        description="Metadatos (ej: número de trayectorias, orden de los métodos)."
+    )
@@ -0,0 +1,188 @@
+# app/services/_kernels.py
+"""
+Kernels numéricos compilados con Numba (Euler, RK4, RK45 adaptativo, lotes
+y errores).
+
+Los pasos de cada método se escriben una sola vez con `jitable`: Numba los
+inserta en los kernels compilados y, sin Numba o con una f(t, y) no compilada,
+los mismos pasos se ejecutan como funciones normales vía `kernel.py_func`.
+"""
+import numpy as np
+from app.core.jit import (
+    ADAPTIVE_SIG, BATCH_SIG, ERRORS_SIG, SOLVER_SIG, jitable, njit,
+)
+
+
+@jitable
+def _euler_step(f_num, t_n, y_n, h_n):
+    return y_n + h_n * f_num(t_n, y_n)
+
+
+@jitable
+def _rk4_step(f_num, t_n, y_n, h_n):
+    h_half = 0.5 * h_n
+    t_half = t_n + h_half
+    k1 = f_num(t_n, y_n)
+    k2 = f_num(t_half, y_n + h_half * k1)
+    k3 = f_num(t_half, y_n + h_half * k2)
+    k4 = f_num(t_n + h_n, y_n + h_n * k3)
+    return y_n + (h_n / 6.0) * (k1 + 2.0 * (k2 + k3) + k4)
+
+
+@njit(SOLVER_SIG, cache=True, fastmath=True, nogil=True)
+def _euler_kernel(f_num, grid, y0):
+    n = grid.shape[0]
+    y_values = np.empty(n, dtype=np.float64)
+    y_values[0] = y0
+
+    for i in range(n - 1):
+        h_n = grid[i+1] - grid[i]  # por si el último paso se ajusta a T
+        y_values[i+1] = _euler_step(f_num, grid[i], y_values[i], h_n)
+
+    return y_values
+
+
+@njit(SOLVER_SIG, cache=True, fastmath=True, nogil=True)
+def _rk4_kernel(f_num, grid, y0):
+    n = grid.shape[0]
+    y_values = np.empty(n, dtype=np.float64)
+    y_values[0] = y0
+
+    for i in range(n - 1):
+        h_n = grid[i+1] - grid[i]  # ajustar último paso
+        y_values[i+1] = _rk4_step(f_num, grid[i], y_values[i], h_n)
+
+    return y_values
+
+
+@jitable
+def _rkck_step(f_num, t_n, y_n, h_n):
+    # Cash-Karp: seis etapas dan la solución de orden 5 y, con otros pesos,
+    # una de orden 4; su diferencia estima el error local del paso
+    k1 = f_num(t_n, y_n)
+    k2 = f_num(t_n + 0.2 * h_n, y_n + h_n * (0.2 * k1))
+    k3 = f_num(t_n + 0.3 * h_n, y_n + h_n * (3.0/40.0 * k1 + 9.0/40.0 * k2))
+    k4 = f_num(t_n + 0.6 * h_n, y_n + h_n * (0.3 * k1 - 0.9 * k2 + 1.2 * k3))
+    k5 = f_num(
+        t_n + h_n,
+        y_n + h_n * (-11.0/54.0 * k1 + 2.5 * k2 - 70.0/27.0 * k3 + 35.0/27.0 * k4),
+    )
+    k6 = f_num(
+        t_n + 0.875 * h_n,
+        y_n + h_n * (1631.0/55296.0 * k1 + 175.0/512.0 * k2 + 575.0/13824.0 * k3
+                     + 44275.0/110592.0 * k4 + 253.0/4096.0 * k5),
+    )
+    y_next = y_n + h_n * (37.0/378.0 * k1 + 250.0/621.0 * k3 + 125.0/594.0 * k4
+                          + 512.0/1771.0 * k6)
+    err = h_n * ((37.0/378.0 - 2825.0/27648.0) * k1 + (250.0/621.0 - 18575.0/48384.0) * k3
+                 + (125.0/594.0 - 13525.0/55296.0) * k4 - 277.0/14336.0 * k5
+                 + (512.0/1771.0 - 0.25) * k6)
+    return y_next, err
+
+
+# Sin fastmath: el control de paso necesita detectar errores NaN.
+@njit(ADAPTIVE_SIG, cache=True, nogil=True)
+def _rkck_kernel(f_num, t0, T, y0, h0, tol, max_points):
+    t_values = np.empty(max_points, dtype=np.float64)
+    y_values = np.empty(max_points, dtype=np.float64)
+    t_values[0] = t0
+    y_values[0] = y0
+
+    # Paso mínimo: por debajo, t_n + h_n ya no se distingue de t_n
+    h_min = 1e-12 * max(1.0, abs(t0), abs(T))
+    t_n = t0
+    y_n = y0
+    h_n = min(max(h0, h_min), T - t0)
+    m = 1
+    rejected = 0
+
+    # Los pasos aceptados (puntos de salida) están acotados por max_points
+    while t_n < T and m < max_points:
+        last = t_n + h_n >= T
+        if last:
+            h_n = T - t_n  # el último paso termina exactamente en T
+
+        y_next, err = _rkck_step(f_num, t_n, y_n, h_n)
+        # Tolerancia absoluta para |y| < 1 y relativa para |y| >= 1
+        ratio = abs(err) / (tol * max(1.0, abs(y_n)))
+
+        if ratio <= 1.0:
+            t_n = T if last else t_n + h_n
+            y_n = y_next
+            t_values[m] = t_n
+            y_values[m] = y_n
+            m += 1
+            # Crece a lo sumo x5 en zonas suaves
+            factor = 5.0 if ratio < 1e-4 else min(5.0, 0.9 * ratio ** -0.2)
+        else:
+            rejected += 1
+            # Paso rechazado (o NaN): se achica a lo sumo x10 y se reintenta
+            factor = 0.1 if ratio != ratio else max(0.1, 0.9 * ratio ** -0.25)
+            if h_n * factor < h_min:
+                break  # el paso se volvió despreciable: no se puede avanzar
+        h_n *= factor
+
+    return t_values[:m].copy(), y_values[:m].copy(), rejected
+
+
+# Lotes: una trayectoria por fila de Y (B, n); cada una avanza con el mismo paso
+# que los kernels simples. Sin parallel=True: se llaman desde varios hilos del
+# pool de cálculo a la vez y no todas las capas de hilos de Numba lo soportan;
+# el paralelismo viene de nogil y del pool.
+@njit(BATCH_SIG, cache=True, fastmath=True, nogil=True)
+def _euler_batch_kernel(f_num, grid, y0s):
+    n = grid.shape[0]
+    y_values = np.empty((y0s.shape[0], n), dtype=np.float64)
+
+    for b in range(y0s.shape[0]):
+        y_values[b, 0] = y0s[b]
+        for i in range(n - 1):
+            h_n = grid[i+1] - grid[i]
+            y_values[b, i+1] = _euler_step(f_num, grid[i], y_values[b, i], h_n)
+
+    return y_values
+
+
+@njit(BATCH_SIG, cache=True, fastmath=True, nogil=True)
+def _rk4_batch_kernel(f_num, grid, y0s):
+    n = grid.shape[0]
+    y_values = np.empty((y0s.shape[0], n), dtype=np.float64)
+
+    for b in range(y0s.shape[0]):
+        y_values[b, 0] = y0s[b]
+        for i in range(n - 1):
+            h_n = grid[i+1] - grid[i]
+            y_values[b, i+1] = _rk4_step(f_num, grid[i], y_values[b, i], h_n)
+
+    return y_values
+
+
+# Sin fastmath: los NaN de la solución exacta deben poder detectarse.
+@njit(ERRORS_SIG, cache=True, nogil=True)
+def _error_matrix_kernel(approx, exact):
+    m, n = approx.shape
+    errs = np.empty((m, n), dtype=np.float64)
+    max_err = np.empty(m, dtype=np.float64)
+    rmse = np.empty(m, dtype=np.float64)
+
+    # Una sola pasada por fila: error, máximo y suma de cuadrados a la vez
+    for j in range(m):
+        mx = 0.0
+        sum_sq = 0.0
+        count = 0
+        for i in range(n):
+            e = abs(approx[j, i] - exact[i])
+            errs[j, i] = e
+            if e == e:
+                if e > mx:
+                    mx = e
+                sum_sq += e * e
+                count += 1
+        if count == 0:
+            max_err[j] = np.nan
+            rmse[j] = np.nan
+        else:
+            max_err[j] = mx
+            rmse[j] = np.sqrt(sum_sq / count)
+
+    return errs, max_err, rmse
@@ -1,38 +1,167 @@
 # app/services/analytic_solver.py
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+import math
+import numpy as np
 import sympy as sp
 from app.core.grid import build_time_grid
+from app.core.parser import affine_coefficients
+
+# Símbolos compartidos (las expresiones de SymPy son inmutables)
+_T = sp.symbols('t')
+_Y_FUNC = sp.Function('y')
+_Y_SYM = sp.symbols('y')
+_Y_OF_T = _Y_FUNC(_T)
+
+# Funciones especiales que dsolve usa a menudo (ej: erf en y' = t*y + 2) y que
+# NumPy no trae: se evalúan elemento a elemento con math
+_SPECIAL_FUNCTIONS = {
+    "erf": np.vectorize(math.erf, otypes=[np.float64]),
+    "erfc": np.vectorize(math.erfc, otypes=[np.float64]),
+    "gamma": np.vectorize(math.gamma, otypes=[np.float64]),
+    "loggamma": np.vectorize(math.lgamma, otypes=[np.float64]),
+}
+
+
+@lru_cache(maxsize=256)
+def _exact_function(expr_srepr: str) -> Callable:
+    """
+    Devuelve y_exact(t) vectorizada con NumPy (más las funciones especiales de
+    _SPECIAL_FUNCTIONS), cacheada por srepr de la expresión.
+    """
+    return sp.lambdify(_T, sp.sympify(expr_srepr), modules=[_SPECIAL_FUNCTIONS, "numpy"])
+
+
+@lru_cache(maxsize=256)
+def _exact_function_math(expr_srepr: str) -> Callable:
+    """
+    Devuelve y_exact(t) escalar con el módulo math, cacheada por srepr de la expresión.
+    """
+    return sp.lambdify(_T, sp.sympify(expr_srepr), modules="math")
+
+
+def _evaluate_pointwise(expr_srepr: str, grid: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Evalúa la solución exacta punto a punto con math; los puntos que fallan quedan como NaN.
+    Si la expresión no se puede traducir a Python (ej: integrales sin resolver) devuelve None.
+    """
+    try:
+        y_exact_num = _exact_function_math(expr_srepr)
+    except Exception:
+        return None
+    vals = np.empty(grid.shape[0], dtype=np.float64)
+    for i, ti in enumerate(grid.tolist()):
+        try:
+            vals[i] = float(y_exact_num(ti))
+        except Exception:
+            vals[i] = np.nan
+    return vals
+
+
+def _evaluate_exact(y_exact_expr: sp.Expr, grid: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Evalúa la solución exacta en todo el grid con una sola llamada vectorizada.
+    Si la expresión no se puede evaluar con NumPy, se evalúa punto a punto con math.
+    Los puntos donde no está definida, es compleja o no es finita quedan como NaN.
+    Si tampoco se puede evaluar con math devuelve None.
+    """
+    expr_srepr = sp.srepr(y_exact_expr)
+    try:
+        y_exact_vec = _exact_function(expr_srepr)
+        with np.errstate(all="ignore"):
+            vals = np.asarray(y_exact_vec(grid))
+            if np.iscomplexobj(vals):
+                vals = np.where(vals.imag == 0, vals.real, np.nan)
+            vals = np.broadcast_to(vals.astype(np.float64), grid.shape)
+    except Exception:
+        # Funciones sin equivalente en NumPy: se vuelve a la evaluación escalar
+        vals = _evaluate_pointwise(expr_srepr, grid)
+        if vals is None:
+            return None
+
+    return np.where(np.isfinite(vals), vals, np.nan)
+
+
+def _build_ode(f_sym: sp.Expr) -> sp.Eq:
+    """
+    Construye la ecuación y'(t) = f(t, y(t)) a partir de f_sym(t, y).
+    """
+    # Sustituir el símbolo y por y(t) en f_sym si es necesario
+    f_sym_subs = f_sym
+    if f_sym.has(_Y_SYM):
+        # xreplace es un reemplazo estructural directo, más barato que subs
+        f_sym_subs = f_sym.xreplace({_Y_SYM: _Y_OF_T})
+
+    return sp.Eq(sp.diff(_Y_OF_T, _T), f_sym_subs)
+
+
+@lru_cache(maxsize=256)
+def _dsolve_cached(f_srepr: str, t0: float, y0: float) -> Optional[sp.Expr]:
+    """
+    Resuelve con dsolve y' = f(t, y), y(t0) = y0, y devuelve la expresión de y(t)
+    (o None si no se pudo resolver). Se cachea por srepr de f: es un string estable
+    y barato de hashear, a diferencia del árbol de SymPy.
+    """
+    ode = _build_ode(sp.sympify(f_srepr))
+
+    try:
+        sol = sp.dsolve(ode, ics={_Y_FUNC(t0): y0})
+    except Exception:
+        return None
+
+    # Si dsolve no lanza error pero devuelve algo raro, lo manejamos
+    try:
+        return sol.rhs  # y(t) = RHS
+    except Exception:
+        return None
+
+
+def _affine_solution(
+    a: sp.Expr,
+    b: sp.Expr,
+    grid: np.ndarray,
+    t0: float,
+    y0: float
+) -> Tuple[sp.Expr, np.ndarray]:
+    """
+    Solución de y' = a·y + b, y(t0) = y0 (a y b constantes):
+      - a = 0:  y(t) = y0 + b·(t - t0)
+      - a != 0: y(t) = (y0 + b/a)·exp(a·(t - t0)) - b/a
+    Devuelve la expresión simbólica (para el LaTeX) y los valores en el grid.
+    """
+    a_num = float(a)
+    b_num = float(b)
+    if a_num == 0.0:
+        expr = y0 + b * (_T - t0)
+        return expr, y0 + b_num * (grid - t0)
+
+    if b_num == 0.0:
+        expr = y0 * sp.exp(a * (_T - t0))
+    else:
+        expr = (y0 + b / a) * sp.exp(a * (_T - t0)) - b / a
+    with np.errstate(over="ignore", invalid="ignore"):
+        values = (y0 + b_num / a_num) * np.exp(a_num * (grid - t0)) - b_num / a_num
+    return expr, np.where(np.isfinite(values), values, np.nan)
 
 
 def analytic_solver(
     f_sym: sp.Expr,
-    t0: float,
-    y0: float,
-    T: float,
-    h: float
-) -> Tuple[List[float], Optional[List[float]], dict]:
+    grid: np.ndarray,
+    y0: float
+) -> Tuple[Optional[np.ndarray], dict]:
 
     """
     Intenta resolver analíticamente la EDO:
         y'(t) = f_sym(t, y(t))
-    con condición inicial y(t0) = y0.
+    con condición inicial y(t0) = y0, donde t0 = grid[0].
 
     Devuelve:
-      - grid de tiempo
-      - exact_values: lista de y_exact(t_n) o None si no se pudo resolver
+      - exact_values: arreglo de y_exact(t_n) o None si no se pudo resolver
       - meta: dict con info simbólica (ecuación, latex, estado)
     """
 
-    t = sp.symbols('t')
-    y = sp.Function('y')
-    # Sustituir el símbolo y por y(t) en f_sym si es necesario
-    f_sym_subs = f_sym
-    y_sym = sp.symbols('y')
-    if f_sym.has(y_sym):
-        f_sym_subs = f_sym.subs(y_sym, y(t))
-
-    ode = sp.Eq(sp.diff(y(t), t), f_sym_subs)
-    grid = build_time_grid(t0, T, h)
+    ode = _build_ode(f_sym)
+    t0 = float(grid[0])
 
     meta = {
         "ode_simplified": str(ode),
@@ -40,31 +169,57 @@ def analytic_solver(
         "analytic_status": None
     }
 
-    try:
-        sol = sp.dsolve(ode, ics={y(t0): y0})
-    except Exception:
-        meta["analytic_status"] = "failed"
-        return grid, None, meta
+    # y' = a·y + b: solución cerrada sin pasar por dsolve
+    coeffs = affine_coefficients(f_sym)
+    if coeffs is not None:
+        y_exact_expr, exact_values = _affine_solution(coeffs[0], coeffs[1], grid, t0, y0)
+        meta["analytic_status"] = "ok"
+        meta["exact_solution_latex"] = sp.latex(sp.Eq(_Y_OF_T, y_exact_expr))
+        return exact_values, meta
 
-    # Si dsolve no lanza error pero devuelve algo raro, lo manejamos
-    try:
-        y_exact_expr = sol.rhs  # y(t) = RHS
-    except Exception:
+    y_exact_expr = _dsolve_cached(sp.srepr(f_sym), t0, float(y0))
+    if y_exact_expr is None:
         meta["analytic_status"] = "failed"
-        return grid, None, meta
+        return None, meta
 
     meta["analytic_status"] = "ok"
-    meta["exact_solution_latex"] = sp.latex(sp.Eq(y(t), y_exact_expr))
+    meta["exact_solution_latex"] = sp.latex(sp.Eq(_Y_OF_T, y_exact_expr))
 
-    # Construimos función numérica y_exact(t)
-    y_exact_num = sp.lambdify(t, y_exact_expr, modules="math")
+    exact_values = _evaluate_exact(y_exact_expr, grid)
+    if exact_values is None:
+        meta["analytic_status"] = "failed"
+
+    return exact_values, meta
 
-    exact_values: List[float] = []
-    for ti in grid:
-        try:
-            val = float(y_exact_num(ti))
-        except Exception:
-            val = float("nan")
-        exact_values.append(val)
 
-    return grid, exact_values, meta
+@lru_cache(maxsize=128)
+def _analytic_cached(
+    f_srepr: str,
+    t0: float,
+    T: float,
+    h: float,
+    y0: float
+) -> Tuple[Optional[np.ndarray], dict]:
+    """
+    analytic_solver cacheado por (srepr de f, t0, T, h, y0): el grid depende solo
+    de (t0, T, h), así que la misma petición no vuelve a evaluar la solución exacta.
+    """
+    grid = build_time_grid(t0, T, h)
+    return analytic_solver(sp.sympify(f_srepr), grid, y0)
+
+
+def analytic_solution(
+    f_sym: sp.Expr,
+    t0: float,
+    T: float,
+    h: float,
+    y0: float
+) -> Tuple[Optional[np.ndarray], dict]:
+    """
+    Igual que analytic_solver sobre build_time_grid(t0, T, h), pero con los valores
+    exactos cacheados. Devuelve copias para que quien llama no altere la caché.
+    """
+    exact_values, meta = _analytic_cached(sp.srepr(f_sym), float(t0), float(T), float(h), float(y0))
+    if exact_values is not None:
+        exact_values = exact_values.copy()
+    return exact_values, dict(meta)
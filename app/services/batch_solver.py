@@ -0,0 +1,115 @@
+# app/services/batch_solver.py
+from typing import Callable, Optional
+import numpy as np
+import sympy as sp
+from app.core.jit import is_jitted
+from app.core.parser import vectorize_rhs
+from app.services._kernels import _euler_batch_kernel, _rk4_batch_kernel
+from app.services.euler_solver import euler_solver
+from app.services.rk4_solver import rk4_solver
+
+# Tablero de Butcher de RK4 clásico: nodos c_i y pesos b_i (sin el factor 1/6)
+_RK4_NODES = np.array([0.0, 0.5, 0.5, 1.0])
+_RK4_WEIGHTS = np.array([1.0, 2.0, 2.0, 1.0])
+
+
+def euler_batch(
+    f_vec: Callable[[float, np.ndarray], np.ndarray],
+    grid: np.ndarray,
+    y0s: np.ndarray
+) -> np.ndarray:
+    """
+    Euler explícito para B condiciones iniciales a la vez.
+    f_vec(t, y) recibe el vector de estados (B,) y devuelve (B,) (ver vectorize_rhs).
+    Devuelve Y con forma (n, B): Y[i, b] = y_b(t_i).
+    """
+    n = grid.shape[0]
+    y_values = np.empty((n, y0s.shape[0]), dtype=np.float64)
+    y_values[0] = y0s
+    steps = np.diff(grid).tolist()  # h_n de cada paso (el último puede ajustarse a T)
+    times = grid.tolist()
+
+    for i in range(n - 1):
+        t_n = times[i]
+        y_n = y_values[i]
+        h_n = steps[i]
+
+        y_values[i+1] = y_n + h_n * f_vec(t_n, y_n)
+
+    return y_values
+
+
+def rk4_batch(
+    f_vec: Callable[[float, np.ndarray], np.ndarray],
+    grid: np.ndarray,
+    y0s: np.ndarray
+) -> np.ndarray:
+    """
+    RK4 clásico para B condiciones iniciales a la vez; cada etapa es una sola
+    llamada vectorizada a f_vec sobre las B trayectorias.
+    Las etapas k1..k4 se guardan en una matriz (4, B) y se combinan con un único
+    producto por los pesos (1, 2, 2, 1).
+    Devuelve Y con forma (n, B): Y[i, b] = y_b(t_i).
+    """
+    n = grid.shape[0]
+    y_values = np.empty((n, y0s.shape[0]), dtype=np.float64)
+    y_values[0] = y0s
+    k = np.empty((4, y0s.shape[0]), dtype=np.float64)
+    steps = np.diff(grid).tolist()  # h_n de cada paso (el último puede ajustarse a T)
+    times = grid.tolist()
+
+    for i in range(n - 1):
+        y_n = y_values[i]
+        h_n = steps[i]
+        t_stage = times[i] + h_n * _RK4_NODES
+
+        k[0] = f_vec(t_stage[0], y_n)
+        k[1] = f_vec(t_stage[1], y_n + 0.5 * h_n * k[0])
+        k[2] = f_vec(t_stage[2], y_n + 0.5 * h_n * k[1])
+        k[3] = f_vec(t_stage[3], y_n + h_n * k[2])
+
+        y_values[i+1] = y_n + (h_n / 6.0) * (_RK4_WEIGHTS @ k)
+
+    return y_values
+
+
+def euler_ensemble(
+    f_sym: sp.Expr,
+    f_num: Callable[[float, float], float],
+    grid: np.ndarray,
+    y0s: np.ndarray,
+    lam: Optional[float] = None
+) -> np.ndarray:
+    """
+    Euler para B condiciones iniciales. Con f_num compilada por Numba usa el
+    kernel compilado (una trayectoria tras otra, sin el GIL); si no, la versión
+    vectorizada con NumPy (euler_batch).
+    Si f(t, y) = λ·y y se pasa `lam`, se calcula una sola trayectoria con y0 = 1
+    (producto acumulado de euler_solver) y se escala por cada condición inicial.
+    Devuelve Y con forma (B, n): una fila contigua por trayectoria.
+    """
+    if lam is not None:
+        # y' = λ·y es lineal en y0: todas las trayectorias escalan la misma
+        return np.outer(y0s, euler_solver(f_num, grid, 1.0, lam))
+    if is_jitted(f_num):
+        return _euler_batch_kernel(f_num, grid, y0s)
+    return np.ascontiguousarray(euler_batch(vectorize_rhs(f_sym), grid, y0s).T)
+
+
+def rk4_ensemble(
+    f_sym: sp.Expr,
+    f_num: Callable[[float, float], float],
+    grid: np.ndarray,
+    y0s: np.ndarray,
+    lam: Optional[float] = None
+) -> np.ndarray:
+    """
+    RK4 para B condiciones iniciales (ver euler_ensemble).
+    Devuelve Y con forma (B, n): una fila contigua por trayectoria.
+    """
+    if lam is not None:
+        # y' = λ·y es lineal en y0: todas las trayectorias escalan la misma
+        return np.outer(y0s, rk4_solver(f_num, grid, 1.0, lam))
+    if is_jitted(f_num):
+        return _rk4_batch_kernel(f_num, grid, y0s)
+    return np.ascontiguousarray(rk4_batch(vectorize_rhs(f_sym), grid, y0s).T)
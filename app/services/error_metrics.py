@@ -1,59 +1,44 @@
 # app/services/error_metrics.py
-from typing import List, Optional, Dict
-import math
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+from app.core.jit import NUMBA_AVAILABLE
+from app.services._kernels import _error_matrix_kernel
 
-
-def absolute_errors(
-    approx: List[float],
-    exact: Optional[List[float]]
-) -> Optional[List[float]]:
-    """
-    Calcula errores absolutos |approx - exact| punto a punto.
-    Si exact es None, devuelve None.
-    """
-    if exact is None:
-        return None
-
-    if len(approx) != len(exact):
-        raise ValueError("Las listas approx y exact deben tener la misma longitud.")
-
-    errors: List[float] = []
-    for a, e in zip(approx, exact):
-        if e != e:  # NaN
-            errors.append(float("nan"))
-        else:
-            errors.append(abs(a - e))
-    return errors
+ArrayLike = Union[Sequence[float], np.ndarray]
 
 
-def summary_error_metrics(
-    approx: List[float],
-    exact: Optional[List[float]]
-) -> Optional[Dict[str, Optional[float]]]:
+def error_matrix(
+    approx_matrix: np.ndarray,
+    exact: Optional[ArrayLike]
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
     """
-    Devuelve métricas resumen del error:
-      - max: error máximo
-      - rmse: raíz del error cuadrático medio
+    Errores de varios métodos a la vez. approx_matrix tiene forma (M, N):
+    una fila por método, alineadas con exact (N,).
 
+    Devuelve (errores (M, N), max (M,), rmse (M,)); los NaN de exact se ignoran
+    en las métricas y una fila sin puntos válidos tiene max y rmse NaN.
     Si exact es None, devuelve None.
-    Ignora valores NaN en el cálculo.
     """
     if exact is None:
         return None
 
-    errs = absolute_errors(approx, exact)
-    if errs is None:
-        return None
+    exact_arr = np.asarray(exact, dtype=np.float64)
+    if approx_matrix.shape[-1] != exact_arr.shape[0]:
+        raise ValueError("Las listas approx y exact deben tener la misma longitud.")
+
+    if NUMBA_AVAILABLE:
+        # Kernel fusionado: recorre cada fila una sola vez
+        return _error_matrix_kernel(
+            np.ascontiguousarray(approx_matrix, dtype=np.float64), exact_arr
+        )
 
-    # Filtramos NaN
-    valid = [e for e in errs if not math.isnan(e)]
-    if not valid:
-        return {"max": None, "rmse": None}
+    errs = np.abs(approx_matrix - exact_arr[None, :])
+    valid = ~np.isnan(errs)
+    n_valid = valid.sum(axis=1)
 
-    max_err = max(valid)
-    rmse = math.sqrt(sum(e * e for e in valid) / len(valid))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        max_err = np.where(valid, errs, -np.inf).max(axis=1, initial=-np.inf)
+        rmse = np.sqrt(np.where(valid, errs * errs, 0.0).sum(axis=1) / n_valid)
+    max_err[n_valid == 0] = np.nan
 
-    return {
-        "max": max_err,
-        "rmse": rmse
-    }
+    return errs, max_err, rmse
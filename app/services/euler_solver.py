@@ -1,32 +1,31 @@
 # app/services/euler_solver.py
-from typing import List, Callable, Tuple
-from app.core.grid import build_time_grid
-
+from typing import Callable, Optional
+import numpy as np
+from app.core.jit import is_jitted
+from app.services._kernels import _euler_kernel
 
 
 def euler_solver(
     f_num: Callable[[float, float], float],
-    t0: float,
+    grid: np.ndarray,
     y0: float,
-    T: float,
-    h: float
-) -> Tuple[List[float], List[float]]:
+    lam: Optional[float] = None
+) -> np.ndarray:
     """
     Resuelve y' = f(t, y) con método de Euler explícito.
-    Devuelve:
-      - grid de tiempo
-      - lista de y_n
+    Si f_num está compilada con Numba, el bucle corre en el kernel compilado;
+    si no, se usa la misma implementación en Python puro.
+    Si f(t, y) = λ·y y se pasa `lam`, cada paso es y_{n+1} = (1 + λ·h_n)·y_n
+    y la trayectoria completa se obtiene con un producto acumulado, sin bucle.
+    Devuelve y_n (np.ndarray) en los puntos del grid.
     """
-    grid = build_time_grid(t0, T, h)
-    y_values: List[float] = [y0]
-
-    for i in range(len(grid) - 1):
-        t_n = grid[i]
-        y_n = y_values[-1]
-        h_n = grid[i+1] - grid[i]  # por si el último paso se ajusta a T
-
-        k1 = f_num(t_n, y_n)
-        y_next = y_n + h_n * k1
-        y_values.append(float(y_next))
+    if lam is not None:
+        factors = np.empty(grid.shape[0], dtype=np.float64)
+        factors[0] = 1.0
+        np.multiply(lam, np.diff(grid), out=factors[1:])
+        factors[1:] += 1.0
+        with np.errstate(over="ignore", invalid="ignore"):
+            return float(y0) * np.cumprod(factors)
 
-    return grid, y_values
+    kernel = _euler_kernel if is_jitted(f_num) else _euler_kernel.py_func
+    return kernel(f_num, grid, float(y0))
@@ -0,0 +1,20 @@
+# app/services/methods.py
+from typing import Callable, Dict, NamedTuple
+import numpy as np
+from app.services.euler_solver import euler_solver
+from app.services.rk4_solver import rk4_solver
+
+
+class MethodSpec(NamedTuple):
+    """
+    Método numérico registrado: solver(f_num, grid, y0, lam) -> y_n y su orden.
+    """
+    solver: Callable[..., np.ndarray]
+    order: int
+
+
+# Registro de métodos en el orden en que se comparan y se devuelven
+METHODS: Dict[str, MethodSpec] = {
+    "euler": MethodSpec(euler_solver, 1),
+    "rk4": MethodSpec(rk4_solver, 4),
+}
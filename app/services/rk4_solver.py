@@ -1,36 +1,33 @@
 # app/services/rk4_solver.py
-from typing import List, Callable, Tuple
-from app.core.grid import build_time_grid
-
+from typing import Callable, Optional
+import numpy as np
+from app.core.jit import is_jitted
+from app.services._kernels import _rk4_kernel
 
 
 def rk4_solver(
     f_num: Callable[[float, float], float],
-    t0: float,
+    grid: np.ndarray,
     y0: float,
-    T: float,
-    h: float
-) -> Tuple[List[float], List[float]]:
+    lam: Optional[float] = None
+) -> np.ndarray:
     """
     Resuelve y' = f(t, y) con el método clásico de Runge-Kutta de orden 4 (RK4).
-    Devuelve:
-      - grid de tiempo
-      - lista de y_n
+    Si f_num está compilada con Numba, el bucle corre en el kernel compilado;
+    si no, se usa la misma implementación en Python puro.
+    Si f(t, y) = λ·y y se pasa `lam`, cada paso multiplica por el factor de
+    amplificación R(z) = 1 + z + z²/2 + z³/6 + z⁴/24 con z = λ·h_n, y la
+    trayectoria se obtiene con un producto acumulado, sin bucle.
+    Devuelve y_n (np.ndarray) en los puntos del grid.
     """
-    grid = build_time_grid(t0, T, h)
-    y_values: List[float] = [y0]
-
-    for i in range(len(grid) - 1):
-        t_n = grid[i]
-        y_n = y_values[-1]
-        h_n = grid[i+1] - grid[i]  # ajustar último paso
-
-        k1 = f_num(t_n, y_n)
-        k2 = f_num(t_n + 0.5 * h_n, y_n + 0.5 * h_n * k1)
-        k3 = f_num(t_n + 0.5 * h_n, y_n + 0.5 * h_n * k2)
-        k4 = f_num(t_n + h_n, y_n + h_n * k3)
-
-        y_next = y_n + (h_n / 6.0) * (k1 + 2*k2 + 2*k3 + k4)
-        y_values.append(float(y_next))
+    if lam is not None:
+        z = np.empty(grid.shape[0], dtype=np.float64)
+        z[0] = 0.0
+        np.multiply(lam, np.diff(grid), out=z[1:])
+        with np.errstate(over="ignore", invalid="ignore"):
+            # Horner: 1 + z(1 + z/2(1 + z/3(1 + z/4)))
+            factors = 1.0 + z * (1.0 + z / 2.0 * (1.0 + z / 3.0 * (1.0 + z / 4.0)))
+            return float(y0) * np.cumprod(factors)
 
-    return grid, y_values
+    kernel = _rk4_kernel if is_jitted(f_num) else _rk4_kernel.py_func
+    return kernel(f_num, grid, float(y0))
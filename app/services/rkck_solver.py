@@ -0,0 +1,39 @@
+# app/services/rkck_solver.py
+from typing import Callable, Tuple
+import numpy as np
+from app.core.grid import MAX_POINTS
+from app.core.jit import is_jitted
+from app.services._kernels import _rkck_kernel
+
+
+def rkck_solver(
+    f_num: Callable[[float, float], float],
+    t0: float,
+    T: float,
+    y0: float,
+    h0: float,
+    tol: float = 1e-6,
+    max_points: int = MAX_POINTS
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Resuelve y' = f(t, y) con Runge-Kutta adaptativo RK4(5) de Cash-Karp.
+    Cada paso reutiliza las seis etapas para obtener la solución de orden 5 y
+    una estimación del error local; h0 es el paso inicial y el paso se agranda
+    o achica para mantener el error local por debajo de tol.
+    Devuelve (grid, y_n, pasos rechazados); el grid lo elige el método.
+    """
+    if T <= t0:
+        raise ValueError("Se requiere T > t0 para construir el intervalo.")
+
+    kernel = _rkck_kernel if is_jitted(f_num) else _rkck_kernel.py_func
+    grid, y_values, rejected = kernel(
+        f_num, float(t0), float(T), float(y0), float(h0), float(tol), int(max_points)
+    )
+
+    if grid[-1] < T:
+        raise ValueError(
+            f"RK45 adaptativo no llegó a T = {T}: se alcanzó el máximo de puntos "
+            f"({max_points}) o el paso se volvió demasiado chico. Aumenta tol."
+        )
+
+    return grid, y_values, int(rejected)
@@ -1,5 +1,8 @@
 import sys
 import os
+import asyncio
+import inspect
+import orjson
 
 # Agregamos el directorio actual al path
 sys.path.append(os.getcwd())
@@ -11,6 +14,16 @@ from app.api.v1.routes_rk4 import solve_rk4
 from app.api.v1.routes_analytic import solve_analytic
 from app.api.v1.routes_errors import solve_all
 
+def call_endpoint(func, req):
+    # Los endpoints son async: los ejecutamos con asyncio.run
+    result = func(req)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    # Algunos endpoints devuelven directamente la respuesta JSON ya serializada
+    if hasattr(result, "body"):
+        result = orjson.loads(result.body)
+    return result
+
 def run_test(name, func, request_model, payload):
     print(f"\n--- Probando {name} ---")
     print(f"Payload: {payload}")
@@ -20,10 +33,10 @@ def run_test(name, func, request_model, payload):
         req = request_model(**payload)
         
         # Llamamos a la función del endpoint directamente
-        response = func(req)
+        response = call_endpoint(func, req)
         
         # Pydantic models se pueden convertir a dict para visualización
-        data = response.dict()
+        data = response if isinstance(response, dict) else response.dict()
         
         if "grid" in data:
             print(f"Grid size: {len(data['grid'])}")
@@ -73,7 +86,28 @@ def run_tests():
     }
     run_test("Comparación (Stiff)", solve_all, ErrorAnalysisRequest, payload_stiff)
 
-    # 5. Validación (Simulada)
+    # 5. Regresión: la solución exacta de y' = t*y + 2 usa erf
+    payload_erf = {
+        "f": "t*y + 2",
+        "t0": 0.5,
+        "y0": 1.0,
+        "T": 2.0,
+        "h": 0.5
+    }
+    print(f"\n--- Probando Analítico con erf ---")
+    try:
+        data = call_endpoint(solve_analytic, AnalyticRequest(**payload_erf))
+        expected = [1.0, 2.6938378502, 6.4510617062, 17.1073088698]
+        exact = data["exact"]
+        if exact is None or any(abs(a - b) > 1e-6 * abs(b) for a, b in zip(exact, expected)):
+            print(f"❌ FALLÓ: se esperaba {expected} y se obtuvo {exact}")
+        else:
+            print(f"Exact y: {exact}")
+            print("✅ PRUEBA EXITOSA")
+    except Exception as e:
+        print(f"❌ FALLÓ: {e}")
+
+    # 6. Validación (Simulada)
     # Al instanciar ODEBaseRequest Pydantic lanzará error si los tipos están mal, 
     # pero si el error es de lógica en 'solve_euler' (ej: parseo), lo atraparemos.
     payload_bad_func = {
@@ -84,7 +118,7 @@ def run_tests():
     try:
         req = ODEBaseRequest(**payload_bad_func)
         # Esto debería fallar dentro de la función por el parser
-        solve_euler(req)
+        call_endpoint(solve_euler, req)
         print("❌ FALLÓ: Debió lanzar excepción HTTPException o ValueError")
     except Exception as e:
         print(f"✅ PRUEBA EXITOSA (Capturó error esperado): {e}")